@@ -0,0 +1,61 @@
+"""unique index on lower(email) for users
+
+Revision ID: 7c1e4a9b2d30
+Revises:
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e4a9b2d30'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Fresh databases get their tables (and this index) from create_all at
+    # application startup, which runs after the migrations
+    if not sa.inspect(op.get_bind()).has_table('users'):
+        return
+
+    # Emails that differ only in case would violate the new index. Which
+    # account keeps the address is an operator decision, so the migration
+    # stops and lists the conflicts instead of rewriting user data.
+    conflicts = op.get_bind().execute(sa.text(
+        """
+        SELECT email, id
+        FROM users
+        WHERE lower(email) IN (
+            SELECT lower(email) FROM users
+            WHERE email IS NOT NULL
+            GROUP BY lower(email)
+            HAVING count(*) > 1
+        )
+        ORDER BY lower(email), id
+        """
+    )).all()
+    if conflicts:
+        rows = "\n".join(f"  {email}: user id {user_id}" for email, user_id in conflicts)
+        raise RuntimeError(
+            "Cannot create ix_users_email_lower: these users have emails that "
+            "differ only in case. Change or merge the accounts so each "
+            "lower(email) is unique, then rerun the migration.\n" + rows
+        )
+
+    op.create_index(
+        'ix_users_email_lower',
+        'users',
+        [sa.text('lower(email)')],
+        unique=True,
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_email_lower', table_name='users', if_exists=True)
@@ -0,0 +1,45 @@
+"""composite indexes for shop-scoped queries
+
+Revision ID: b3d9f6e1a7c4
+Revises: 7c1e4a9b2d30
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d9f6e1a7c4'
+down_revision: Union[str, None] = '7c1e4a9b2d30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, columns), matching the models' __table_args__
+INDEXES = (
+    ('ix_shop_owner_id', 'shops', ['owner_id', 'id']),
+    ('ix_barber_shop_id', 'barbers', ['shop_id', 'id']),
+    ('ix_service_shop_id', 'services', ['shop_id', 'id']),
+    ('ix_appointment_shop_time', 'appointments', ['shop_id', 'appointment_time']),
+    ('ix_queue_shop_status_checkin', 'queue_entries', ['shop_id', 'status', 'check_in_time']),
+    ('ix_queue_shop_status_pos', 'queue_entries', ['shop_id', 'status', 'position_in_queue']),
+)
+
+
+def upgrade() -> None:
+    # create_all only adds indexes along with a new table, so databases
+    # created before these were declared need them here. Fresh databases
+    # get their tables (and these indexes) from create_all at application
+    # startup, which runs after the migrations.
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        if inspector.has_table(table):
+            op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
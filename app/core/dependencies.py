@@ -18,7 +18,7 @@ ALGORITHM = os.getenv("ALGORITHM")
 
 logger = logging.getLogger(__name__)
 
-async def get_current_user(
+def get_current_user(
     db: Session = Depends(get_db),
     token: str = Depends(oauth2_scheme)
 ) -> User:
@@ -37,12 +37,12 @@ async def get_current_user(
         logger.error(f"Token decode error: {str(e)}")
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    user = db.get(User, int(user_id))
     if user is None:
         logger.error(f"User not found for ID: {user_id}")
         raise credentials_exception
         
-    logger.debug(f"Retrieved user: ID={user.id}, Role={user.role}")
+    logger.debug("Retrieved user: ID=%s, Role=%s", user.id, user.role)
     return user
 
 def get_current_active_user(current_user: models.User = Depends(get_current_user)):
@@ -53,7 +53,10 @@ def get_current_active_user(current_user: models.User = Depends(get_current_user
 
 def get_current_user_by_role(required_role: UserRole):
     async def role_checker(current_user: User = Depends(get_current_user)) -> User:
-        logger.debug(f"Checking role for user {current_user.id}: {current_user.role} against required: {required_role}")
+        logger.debug(
+            "Checking role for user %s: %s against required: %s",
+            current_user.id, current_user.role, required_role
+        )
         
         if current_user.role != required_role:
             logger.error(f"Role mismatch for user {current_user.id}: has {current_user.role}, needs {required_role}")
@@ -17,7 +17,19 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 def get_engine(retries=5, delay=2):
     for i in range(retries):
         try:
-            engine = create_engine(DATABASE_URL)
+            # Room for every distinct statement the routers compile, so none
+            # are evicted and recompiled under load
+            engine = create_engine(
+                DATABASE_URL,
+                query_cache_size=1200,
+                # Sync routes run concurrently on the threadpool; size the pool
+                # so they rarely wait for a connection, and replace stale
+                # connections before use instead of failing a request
+                pool_size=20,
+                max_overflow=10,
+                pool_recycle=3600,
+                pool_pre_ping=True
+            )
             engine.connect()
             return engine
         except OperationalError:
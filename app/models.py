@@ -14,10 +14,12 @@ from sqlalchemy import (
     Enum,
     Table,
     UniqueConstraint,
+    Index,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
+from app.utils.time_utils import format_time
 import enum
 
 
@@ -79,6 +81,14 @@ class User(Base):
     role = Column(Enum(UserRole), default=UserRole.USER)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # Emails are matched case-insensitively; this index serves those lookups
+    # and keeps addresses differing only in case from both being registered.
+    # Databases created before it was added get it from alembic revision
+    # 7c1e4a9b2d30.
+    __table_args__ = (
+        Index('ix_users_email_lower', func.lower(email), unique=True),
+    )
+
     # Relationships
     shops = relationship("Shop", back_populates="owner", cascade="all, delete")
     barber_profile = relationship(
@@ -114,6 +124,11 @@ class Shop(Base):
     advertisement_end_date = Column(DateTime, nullable=True)
     is_advertisement_active = Column(Boolean, default=False)
 
+    # Covers the (id, owner_id) ownership check run by every owner endpoint
+    __table_args__ = (
+        Index('ix_shop_owner_id', 'owner_id', 'id'),
+    )
+
     # Relationships
     owner = relationship("User", back_populates="shops")
     barbers = relationship(
@@ -132,6 +147,10 @@ class Shop(Base):
         "Feedback", back_populates="shop", cascade="all, delete-orphan"
     )
 
+    @property
+    def formatted_hours(self):
+        return f"{format_time(self.opening_time)} - {format_time(self.closing_time)}"
+
 
 class Barber(Base):
     __tablename__ = "barbers"
@@ -141,6 +160,10 @@ class Barber(Base):
     shop_id = Column(Integer, ForeignKey("shops.id"), nullable=False)
     status = Column(Enum(BarberStatus), default=BarberStatus.AVAILABLE)
 
+    __table_args__ = (
+        Index('ix_barber_shop_id', 'shop_id', 'id'),
+    )
+
     # Relationships
     user = relationship("User", back_populates="barber_profile")
     shop = relationship("Shop", back_populates="barbers")
@@ -157,6 +180,23 @@ class Barber(Base):
         "BarberSchedule", back_populates="barber", cascade="all, delete-orphan"
     )
 
+    # User details exposed for responses built straight from a Barber
+    @property
+    def full_name(self):
+        return self.user.full_name
+
+    @property
+    def email(self):
+        return self.user.email
+
+    @property
+    def phone_number(self):
+        return self.user.phone_number
+
+    @property
+    def is_active(self):
+        return self.user.is_active
+
 
 class Service(Base):
     __tablename__ = "services"
@@ -167,6 +207,10 @@ class Service(Base):
     price = Column(Float, nullable=False)
     shop_id = Column(Integer, ForeignKey("shops.id"), nullable=False)
 
+    __table_args__ = (
+        Index('ix_service_shop_id', 'shop_id', 'id'),
+    )
+
     # Relationships
     shop = relationship("Shop", back_populates="services")
     barbers = relationship(
@@ -197,6 +241,11 @@ class Appointment(Base):
     phone_number = Column(String, nullable=True, index=True)
     number_of_people = Column(Integer, default=1)
 
+    # Covers the per-shop, per-day range scans used by reports
+    __table_args__ = (
+        Index('ix_appointment_shop_time', 'shop_id', 'appointment_time'),
+    )
+
     # Relationships
     user = relationship("User", back_populates="appointments")
     shop = relationship("Shop", back_populates="appointments")
@@ -245,6 +294,13 @@ class QueueEntry(Base):
     service_start_time = Column(DateTime, nullable=True)
     service_end_time = Column(DateTime, nullable=True)
 
+    # Cover the per-shop active queue lookups: the owner view orders by
+    # check-in time, the public queue by position
+    __table_args__ = (
+        Index('ix_queue_shop_status_checkin', 'shop_id', 'status', 'check_in_time'),
+        Index('ix_queue_shop_status_pos', 'shop_id', 'status', 'position_in_queue'),
+    )
+
     # Relationships
     shop = relationship("Shop", back_populates="queue_entries")
     service = relationship("Service", back_populates="queue_entries")
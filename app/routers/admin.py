@@ -26,11 +26,10 @@ def approve_shop(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_admin)
 ):
-    shop = db.query(models.Shop).filter(models.Shop.id == shop_id).first()
+    shop = db.get(models.Shop, shop_id)
     if not shop:
         raise HTTPException(status_code=404, detail="Shop not found")
     shop.is_approved = True
-    db.add(shop)
     db.commit()
     db.refresh(shop)
     return shop
@@ -49,11 +48,10 @@ def deactivate_user(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_admin)
 ):
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    user = db.get(models.User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     user.is_active = False
-    db.add(user)
     db.commit()
     db.refresh(user)
     return user
@@ -8,7 +8,7 @@ from datetime import datetime
 from typing import List, Optional
 from app.core.dependencies import get_current_active_user
 from sqlalchemy import func
-from app.utils.shop_utils import calculate_wait_time, format_time, is_shop_open
+from app.utils.shop_utils import calculate_wait_time, calculate_wait_times, is_shop_open, invalidate_wait_time
 from sqlalchemy.orm import joinedload
 
 router = APIRouter(prefix="/appointments", tags=["Appointments"])
@@ -32,6 +32,7 @@ def create_appointment(
 
     db.add(new_appointment)
     db.commit()
+    invalidate_wait_time(appointment_in.shop_id)
     db.refresh(new_appointment)
     return new_appointment
 
@@ -62,13 +63,14 @@ def cancel_appointment(
     if appointment.status != models.AppointmentStatus.SCHEDULED:
         raise HTTPException(status_code=400, detail="Cannot cancel an appointment that is not scheduled")
     appointment.status = models.AppointmentStatus.CANCELLED
-    db.add(appointment)
+    shop_id = appointment.shop_id
     db.commit()
+    invalidate_wait_time(shop_id)
     return
 
 
 @router.get("/shops", response_model=schemas.ShopListResponse)
-async def get_shops(
+def get_shops(
     page: int = Query(default=1, gt=0),
     limit: int = Query(default=10, gt=0, le=100),
     search: Optional[str] = Query(default=None),
@@ -89,10 +91,11 @@ async def get_shops(
     shops = query.offset(skip).limit(limit).all()
     
     # Calculate wait times and check if shop is open
+    current_time = datetime.now().time()
+    wait_times = calculate_wait_times(db, [shop.id for shop in shops])
     for shop in shops:
-        shop.estimated_wait_time = calculate_wait_time(db, shop.id)
-        shop.is_open = is_shop_open(shop)
-        shop.formatted_hours = f"{format_time(shop.opening_time)} - {format_time(shop.closing_time)}"
+        shop.estimated_wait_time = wait_times[shop.id]
+        shop.is_open = is_shop_open(shop, current_time)
         # Ensure shop.id is included in the response
         shop.id = shop.id  # This is already available from the model, just making it explicit
     
@@ -105,7 +108,7 @@ async def get_shops(
 
 
 @router.get("/shop/{shop_id}", response_model=schemas.ShopDetailedResponse)
-async def get_shop_details(
+def get_shop_details(
     shop_id: int,
     db: Session = Depends(get_db)
 ):
@@ -134,19 +137,12 @@ async def get_shop_details(
     # Calculate additional shop details
     shop.estimated_wait_time = calculate_wait_time(db, shop.id)
     shop.is_open = is_shop_open(shop)
-    shop.formatted_hours = f"{format_time(shop.opening_time)} - {format_time(shop.closing_time)}"
 
-    # Process barber schedules
+    # Process barber schedules; barber user details come from the
+    # eager-loaded user through Barber's properties
     day_names = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
     
     for barber in shop.barbers:
-        # Add user details to barber
-        barber.full_name = barber.user.full_name
-        barber.email = barber.user.email
-        barber.phone_number = barber.user.phone_number
-        barber.is_active = barber.user.is_active
-
-        # Process schedules
         for schedule in barber.schedules:
             schedule.day_name = day_names[schedule.day_of_week]
 
@@ -1,6 +1,7 @@
 # app/routers/auth.py
 
 from fastapi import APIRouter, Depends, HTTPException, status, Form
+from sqlalchemy import select, exists, func
 from sqlalchemy.orm import Session
 from app import models, schemas
 from app.schemas import TIMEZONE, convert_to_utc
@@ -20,16 +21,16 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 
 @router.post("/register/shop-owner", response_model=schemas.UserResponse)
-async def register_shop_owner(
+def register_shop_owner(
     registration: schemas.ShopOwnerRegistration,
     db: Session = Depends(get_db)
 ):
     # Check if user exists with email or phone
-    existing_user = db.query(models.User).filter(
-        (models.User.email == registration.email) |
+    user_exists = db.scalar(select(exists().where(
+        (func.lower(models.User.email) == registration.email.lower()) |
         (models.User.phone_number == registration.phone_number)
-    ).first()
-    if existing_user:
+    )))
+    if user_exists:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User with this email or phone number already exists"
@@ -51,15 +52,30 @@ async def register_shop_owner(
     
     return db_user
 
+def _get_user_by_username(db: Session, username: str):
+    """Look up a user by email or phone number with a single indexed lookup"""
+    # Emails always contain an @ and phone numbers never do, so only one of
+    # the two unique indexes has to be searched
+    if "@" not in username:
+        return db.execute(
+            select(models.User).where(models.User.phone_number == username)
+        ).scalar_one_or_none()
+
+    users = db.execute(
+        select(models.User).where(func.lower(models.User.email) == username.lower())
+    ).scalars().all()
+    if len(users) > 1:
+        # Case-only duplicates can only exist before the lower(email) index
+        # migration has run; fall back to the exact address
+        return next((user for user in users if user.email == username), None)
+    return users[0] if users else None
+
 @router.post("/login", response_model=schemas.TokenWithUserDetails)
-async def login_json(
+def login_json(
     login_data: schemas.LoginRequest,
     db: Session = Depends(get_db)
 ):
-    user = db.query(models.User).filter(
-        (models.User.email == login_data.username) |
-        (models.User.phone_number == login_data.username)
-    ).first()
+    user = _get_user_by_username(db, login_data.username)
     
     if not user:
         raise HTTPException(
@@ -97,15 +113,11 @@ async def login_json(
     }
 
 @router.post("/login/form", response_model=schemas.TokenWithUserDetails)
-async def login_for_access_token(
+def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
-    print(form_data)
-    user = db.query(models.User).filter(
-        (models.User.email == form_data.username) |
-        (models.User.phone_number == form_data.username)
-    ).first()
+    user = _get_user_by_username(db, form_data.username)
     
     if not user:
         raise HTTPException(
@@ -113,7 +125,7 @@ async def login_for_access_token(
             detail="Incorrect username or password"
         )
     
-    logger.debug(f"Login attempt for user: ID={user.id}, Role={user.role}")
+    logger.debug("Login attempt for user: ID=%s, Role=%s", user.id, user.role)
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -1,6 +1,8 @@
 # app/routers/barbers.py
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import update, delete
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload
 from typing import List
 from datetime import datetime
@@ -8,6 +10,7 @@ from app import models, schemas
 from app.database import get_db
 from app.core.dependencies import get_current_user_by_role
 from app.models import UserRole, AppointmentStatus
+from app.utils.shop_utils import invalidate_wait_time
 
 router = APIRouter(prefix="/barbers", tags=["Barbers"])
 
@@ -52,9 +55,9 @@ def update_appointment_status(
     elif status_update.status == AppointmentStatus.IN_SERVICE:
         appointment.actual_start_time = datetime.utcnow()
 
-    db.add(appointment)
     db.commit()
     db.refresh(appointment)
+    invalidate_wait_time(appointment.shop_id)
     return appointment
 
 @router.post("/schedules/", response_model=schemas.BarberScheduleResponse)
@@ -67,31 +70,28 @@ def create_schedule(
     if not barber:
         raise HTTPException(status_code=404, detail="Barber profile not found")
 
-    existing_schedule = db.query(models.BarberSchedule).filter(
-        models.BarberSchedule.barber_id == barber.id,
-        models.BarberSchedule.day_of_week == schedule_in.day_of_week
-    ).first()
-    
-    if existing_schedule:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Schedule already exists for day {schedule_in.day_of_week}"
-        )
-
     new_schedule = models.BarberSchedule(
-        barber_id=barber.id,
+        barber=barber,
         day_of_week=schedule_in.day_of_week,
         start_time=schedule_in.start_time,
         end_time=schedule_in.end_time
     )
 
     db.add(new_schedule)
+    try:
+        db.flush()
+    except IntegrityError:
+        # uix_barber_day allows one schedule per barber per day
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Schedule already exists for day {schedule_in.day_of_week}"
+        )
+
+    # Build the response before commit expires the schedule and its barber
+    response = schemas.BarberScheduleResponse.model_validate(new_schedule)
     db.commit()
-    db.refresh(new_schedule)
-    
-    # Ensure barber relationship is loaded
-    _ = new_schedule.barber
-    return schemas.BarberScheduleResponse.model_validate(new_schedule)
+    return response
 
 @router.get("/schedules/", response_model=List[schemas.BarberScheduleResponse])
 def get_my_schedules(
@@ -108,7 +108,7 @@ def get_my_schedules(
         models.BarberSchedule.barber_id == barber.id
     ).all()
     
-    return [schemas.BarberScheduleResponse.model_validate(schedule) for schedule in schedules]
+    return schemas.BarberScheduleListAdapter.validate_python(schedules)
 
 @router.put("/schedules/{schedule_id}", response_model=schemas.BarberScheduleResponse)
 def update_schedule(
@@ -121,37 +121,36 @@ def update_schedule(
     if not barber:
         raise HTTPException(status_code=404, detail="Barber profile not found")
 
-    schedule = db.query(models.BarberSchedule).filter(
-        models.BarberSchedule.id == schedule_id,
-        models.BarberSchedule.barber_id == barber.id
-    ).first()
+    # Only the fields the client sent; every schedule column is NOT NULL
+    update_data = schedule_update.model_dump(exclude_unset=True, exclude_none=True)
+    if not update_data:
+        raise HTTPException(status_code=400, detail="No fields to update")
+
+    # Single UPDATE ... RETURNING instead of SELECT, UPDATE and refresh
+    try:
+        schedule = db.execute(
+            update(models.BarberSchedule)
+            .where(
+                models.BarberSchedule.id == schedule_id,
+                models.BarberSchedule.barber_id == barber.id
+            )
+            .values(**update_data)
+            .returning(models.BarberSchedule)
+        ).scalar_one_or_none()
+    except IntegrityError:
+        # uix_barber_day allows one schedule per barber per day
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Schedule already exists for day {schedule_update.day_of_week}"
+        )
     if not schedule:
         raise HTTPException(status_code=404, detail="Schedule not found")
 
-    if schedule_update.start_time is not None:
-        schedule.start_time = schedule_update.start_time
-    if schedule_update.end_time is not None:
-        schedule.end_time = schedule_update.end_time
-    if schedule_update.day_of_week is not None:
-        existing_schedule = db.query(models.BarberSchedule).filter(
-            models.BarberSchedule.barber_id == barber.id,
-            models.BarberSchedule.day_of_week == schedule_update.day_of_week,
-            models.BarberSchedule.id != schedule_id
-        ).first()
-        if existing_schedule:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Schedule already exists for day {schedule_update.day_of_week}"
-            )
-        schedule.day_of_week = schedule_update.day_of_week
-
-    db.add(schedule)
+    # Build the response before commit expires the schedule and its barber
+    response = schemas.BarberScheduleResponse.model_validate(schedule)
     db.commit()
-    db.refresh(schedule)
-    
-    # Ensure barber relationship is loaded
-    _ = schedule.barber
-    return schemas.BarberScheduleResponse.model_validate(schedule)
+    return response
 
 @router.delete("/schedules/{schedule_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_schedule(
@@ -163,15 +162,19 @@ def delete_schedule(
     if not barber:
         raise HTTPException(status_code=404, detail="Barber profile not found")
 
-    schedule = db.query(models.BarberSchedule).filter(
-        models.BarberSchedule.id == schedule_id,
-        models.BarberSchedule.barber_id == barber.id
-    ).first()
-    
-    if not schedule:
+    # Nothing is returned and schedules have no dependents, so delete
+    # without loading the row first
+    result = db.execute(
+        delete(models.BarberSchedule)
+        .where(
+            models.BarberSchedule.id == schedule_id,
+            models.BarberSchedule.barber_id == barber.id
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Schedule not found")
 
-    db.delete(schedule)
     db.commit()
     return
 
@@ -1,6 +1,8 @@
 # app/routers/queue.py
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select, exists
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import datetime
@@ -8,7 +10,11 @@ from app import models, schemas
 from app.database import get_db
 from app.models import QueueStatus
 
-router = APIRouter(prefix="/queue", tags=["Queue"])
+router = APIRouter(
+    prefix="/queue",
+    tags=["Queue"],
+    default_response_class=ORJSONResponse
+)
 
 @router.post("/", response_model=schemas.QueueEntryPublicResponse)
 def join_queue(
@@ -16,35 +22,29 @@ def join_queue(
     db: Session = Depends(get_db)
 ):
     # Validate shop exists
-    shop = db.query(models.Shop).filter(models.Shop.id == entry.shop_id).first()
+    shop = db.get(models.Shop, entry.shop_id)
     if not shop:
         raise HTTPException(status_code=404, detail="Shop not found")
 
     # Validate service exists if provided
     if entry.service_id:
-        service = db.query(models.Service).filter(
-            models.Service.id == entry.service_id,
-            models.Service.shop_id == entry.shop_id
-        ).first()
-        if not service:
+        service = db.get(models.Service, entry.service_id)
+        if service is None or service.shop_id != entry.shop_id:
             raise HTTPException(status_code=404, detail="Service not found")
 
     # Validate barber exists if provided
     if entry.barber_id:
-        barber = db.query(models.Barber).filter(
-            models.Barber.id == entry.barber_id,
-            models.Barber.shop_id == entry.shop_id
-        ).first()
-        if not barber:
+        barber = db.get(models.Barber, entry.barber_id)
+        if barber is None or barber.shop_id != entry.shop_id:
             raise HTTPException(status_code=404, detail="Barber not found")
 
     # Check if person is already in queue
-    existing_entry = db.query(models.QueueEntry).filter(
+    already_queued = db.scalar(select(exists().where(
         models.QueueEntry.shop_id == entry.shop_id,
         models.QueueEntry.phone_number == entry.phone_number,
         models.QueueEntry.status == QueueStatus.CHECKED_IN
-    ).first()
-    if existing_entry:
+    )))
+    if already_queued:
         raise HTTPException(status_code=400, detail="Already in queue")
 
     # Calculate position in queue
@@ -98,7 +98,7 @@ def get_queue(
     db: Session = Depends(get_db)
 ):
     # Validate shop exists
-    shop = db.query(models.Shop).filter(models.Shop.id == shop_id).first()
+    shop = db.get(models.Shop, shop_id)
     if not shop:
         raise HTTPException(status_code=404, detail="Shop not found")
 
@@ -1,21 +1,30 @@
 # app/routers/shop_owners.py
 
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form, BackgroundTasks
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select, exists, insert, update, delete, case, literal, lambda_stmt, func, extract, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload, selectinload, contains_eager, load_only, raiseload, with_parent
+from collections import OrderedDict
 from typing import List, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from app import models, schemas
 from app.database import get_db
 from app.core.dependencies import get_current_user_by_role
 from app.core.security import get_password_hash
 from app.models import UserRole
-from app.utils.shop_utils import is_shop_open, calculate_wait_time, format_time
+from app.utils.shop_utils import is_shop_open, calculate_wait_time, calculate_wait_times, invalidate_wait_time
 import logging
-import aiofiles
 import os
+import threading
+import time
 import uuid
 
-router = APIRouter(prefix="/shop-owners", tags=["Shop Owners"])
+router = APIRouter(
+    prefix="/shop-owners",
+    tags=["Shop Owners"],
+    default_response_class=ORJSONResponse
+)
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -23,8 +32,183 @@ logger = logging.getLogger(__name__)
 # Define the dependency with explicit role check
 get_current_shop_owner = get_current_user_by_role(UserRole.SHOP_OWNER)
 
+# Created at application startup
 UPLOAD_DIR = "static/advertisements"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+
+# Allowed advertisement image types and the extension each is saved with
+ADVERTISEMENT_EXTENSIONS = {
+    "image/png": ".png",
+    "image/jpeg": ".jpg",
+    "image/webp": ".webp",
+    "image/gif": ".gif",
+}
+
+# Uploads are copied to disk in 1 MiB chunks and capped at 5 MiB
+UPLOAD_BUFFER_SIZE = 1 << 20
+MAX_ADVERTISEMENT_SIZE = 5 << 20
+
+# Queue entries still waiting or being served
+ACTIVE_QUEUE_STATUSES = (models.QueueStatus.CHECKED_IN, models.QueueStatus.IN_SERVICE)
+
+# Shop fields that update_shop does not write straight through
+AD_FIELDS = frozenset({
+    'has_advertisement',
+    'advertisement_image_url',
+    'advertisement_start_date',
+    'advertisement_end_date',
+})
+
+def _advertisement_file_path(image_url: str) -> str:
+    """Map an advertisement image URL back to its file in UPLOAD_DIR"""
+    return os.path.join(UPLOAD_DIR, os.path.basename(image_url))
+
+def _naive_utc(dt: Optional[datetime]) -> Optional[datetime]:
+    """Store datetimes as naive UTC, the form the DateTime columns read back as"""
+    if dt is not None and dt.tzinfo is not None:
+        return dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+def _remove_file(file_path: str) -> None:
+    """Delete a file if it still exists"""
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+
+# Confirmed (owner_id, shop_id) pairs with the time they were confirmed,
+# oldest first. Shop ownership never changes, so only deletion has to
+# invalidate an entry. Routes run concurrently on the threadpool, so every
+# access holds the lock.
+_owned_shop_cache = OrderedDict()
+_owned_shop_cache_lock = threading.Lock()
+OWNED_SHOP_CACHE_TTL = 30  # seconds
+OWNED_SHOP_CACHE_SIZE = 4096
+
+def _forget_shop_owner(shop_id: int, owner_id: int) -> None:
+    """Drop a cached ownership confirmation"""
+    with _owned_shop_cache_lock:
+        _owned_shop_cache.pop((owner_id, shop_id), None)
+
+# Messages for the unique indexes a barber's user details can collide with,
+# keyed by the constraint name the database reports
+UNIQUE_VIOLATION_MESSAGES = {
+    "ix_users_email": "Email is already in use",
+    "ix_users_email_lower": "Email is already in use",
+    "ix_users_phone_number": "Phone number is already in use",
+}
+
+def _integrity_error_detail(error: IntegrityError, default: str) -> str:
+    """Pick the message for the violated constraint, falling back to default"""
+    diag = getattr(error.orig, "diag", None)
+    return UNIQUE_VIOLATION_MESSAGES.get(getattr(diag, "constraint_name", None), default)
+
+def _owned_shop_clause(shop_id: int, owner_id: int):
+    """EXISTS clause that holds when the shop belongs to the owner"""
+    return exists().where(
+        models.Shop.id == shop_id,
+        models.Shop.owner_id == owner_id
+    )
+
+def _assert_shop_owned(db: Session, shop_id: int, owner_id: int, *, fresh: bool = False) -> None:
+    """Raise 404 unless the shop exists and belongs to the owner
+
+    The cache is per process, so a shop deleted through another worker can
+    still look owned here for up to the TTL. Endpoints that write rows under
+    the shop pass fresh=True to always query, so they answer 404 rather than
+    hitting the shop foreign key.
+    """
+    key = (owner_id, shop_id)
+    with _owned_shop_cache_lock:
+        confirmed_at = _owned_shop_cache.get(key)
+        if confirmed_at is not None:
+            if not fresh and time.monotonic() - confirmed_at < OWNED_SHOP_CACHE_TTL:
+                return
+            del _owned_shop_cache[key]
+
+    # lambda_stmt caches the constructed statement as well as its SQL
+    is_owned = db.scalar(lambda_stmt(lambda: select(exists().where(
+        models.Shop.id == shop_id,
+        models.Shop.owner_id == owner_id
+    ))))
+    if not is_owned:
+        _forget_shop_owner(shop_id, owner_id)
+        raise HTTPException(status_code=404, detail="Shop not found")
+
+    with _owned_shop_cache_lock:
+        _owned_shop_cache[key] = time.monotonic()
+        _owned_shop_cache.move_to_end(key)
+        while len(_owned_shop_cache) > OWNED_SHOP_CACHE_SIZE:
+            # Evict the oldest confirmation
+            _owned_shop_cache.popitem(last=False)
+
+def _barber_response(
+    barber: models.Barber,
+    user: models.User,
+    services: Optional[List[schemas.ServiceResponse]] = None
+) -> schemas.BarberResponse:
+    """Combine a barber and its user into a BarberResponse
+
+    The fields are copied from already loaded rows; response_model still
+    validates the result on the way out.
+    """
+    return schemas.BarberResponse.model_construct(
+        id=barber.id,
+        user_id=user.id,
+        shop_id=barber.shop_id,
+        status=barber.status,
+        full_name=user.full_name,
+        email=user.email,
+        phone_number=user.phone_number,
+        is_active=user.is_active,
+        services=services if services is not None else []
+    )
+
+def get_owned_barber(
+    shop_id: int,
+    barber_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_shop_owner)
+) -> models.Barber:
+    """Get a barber of one of the current owner's shops in a single query"""
+    owner_id = current_user.id
+    barber = db.execute(lambda_stmt(
+        lambda: select(models.Barber)
+        .join(models.Barber.shop)
+        .options(contains_eager(models.Barber.shop))
+        .where(
+            models.Barber.id == barber_id,
+            models.Barber.shop_id == shop_id,
+            models.Shop.owner_id == owner_id
+        )
+    )).scalar_one_or_none()
+    if not barber:
+        raise HTTPException(status_code=404, detail="Barber not found")
+    return barber
+
+def get_owned_schedule(
+    shop_id: int,
+    barber_id: int,
+    schedule_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_shop_owner)
+) -> models.BarberSchedule:
+    """Get a schedule of a barber in one of the current owner's shops in a single query"""
+    owner_id = current_user.id
+    schedule = db.execute(lambda_stmt(
+        lambda: select(models.BarberSchedule)
+        .join(models.BarberSchedule.barber)
+        .join(models.Barber.shop)
+        .options(contains_eager(models.BarberSchedule.barber))
+        .where(
+            models.BarberSchedule.id == schedule_id,
+            models.BarberSchedule.barber_id == barber_id,
+            models.Barber.shop_id == shop_id,
+            models.Shop.owner_id == owner_id
+        )
+    )).scalar_one_or_none()
+    if not schedule:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    return schedule
 
 @router.post("/shops/", response_model=schemas.ShopResponse)
 def create_shop(
@@ -32,8 +216,6 @@ def create_shop(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_shop_owner)
 ):
-    print("shop_in")
-    print(shop_in)
     """Create a new shop with operating hours"""
     new_shop = models.Shop(
         name=shop_in.name,
@@ -48,37 +230,30 @@ def create_shop(
         closing_time=shop_in.closing_time,
         average_wait_time=shop_in.average_wait_time or 0.0,
     )
-    print("new_shop")
-    print(new_shop)
     db.add(new_shop)
     db.commit()
     db.refresh(new_shop)
     return new_shop
 
 @router.get("/shops/", response_model=List[schemas.ShopResponse])
-async def get_my_shops(
+def get_my_shops(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_shop_owner)
 ):
     """Get all shops owned by the current user with operating status"""
-    logger.debug(f"User ID: {current_user.id}, Role: {current_user.role}")
-    
-    if current_user.role != UserRole.SHOP_OWNER:
-        logger.error(f"User {current_user.id} has role {current_user.role}, expected {UserRole.SHOP_OWNER}")
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="User must be a shop owner"
-        )
+    logger.debug("User ID: %s, Role: %s", current_user.id, current_user.role)
     
     shops = db.query(models.Shop).filter(models.Shop.owner_id == current_user.id).all()
     
-    # Add computed fields for each shop
+    # Add computed fields for each shop, reading the clock once per request
+    # and counting appointments for all shops in one query
+    current_time = datetime.now().time()
+    wait_times = calculate_wait_times(db, [shop.id for shop in shops])
     for shop in shops:
-        shop.is_open = is_shop_open(shop)
-        shop.estimated_wait_time = calculate_wait_time(db, shop.id)
-        shop.formatted_hours = f"{format_time(shop.opening_time)} - {format_time(shop.closing_time)}"
+        shop.is_open = is_shop_open(shop, current_time)
+        shop.estimated_wait_time = wait_times[shop.id]
     
-    logger.debug(f"Found {len(shops)} shops for user {current_user.id}")
+    logger.debug("Found %s shops for user %s", len(shops), current_user.id)
     return shops
 
 @router.get("/shops/{shop_id}", response_model=schemas.ShopResponse)
@@ -98,7 +273,6 @@ def get_shop_by_id(
     # Add computed fields
     shop.is_open = is_shop_open(shop)
     shop.estimated_wait_time = calculate_wait_time(db, shop.id)
-    shop.formatted_hours = f"{format_time(shop.opening_time)} - {format_time(shop.closing_time)}"
     
     return shop
 
@@ -110,59 +284,67 @@ def update_shop(
     current_user: models.User = Depends(get_current_shop_owner)
 ):
     """Update shop details including operating hours"""
-    shop = db.query(models.Shop).filter(
-        models.Shop.id == shop_id,
-        models.Shop.owner_id == current_user.id
-    ).first()
-    if not shop:
-        raise HTTPException(status_code=404, detail="Shop not found")
-    
     # Convert input model to dict, excluding None values
     update_data = shop_in.model_dump(exclude_unset=True)
-    
-    # Handle time fields separately to ensure proper validation
-    time_fields = {'opening_time', 'closing_time'}
-    regular_fields = {k: v for k, v in update_data.items() if k not in time_fields}
-    
-    # Update regular fields
-    for field, value in regular_fields.items():
-        if field in ['has_advertisement', 'advertisement_image_url', 'advertisement_start_date', 'advertisement_end_date']:
-            if not shop.has_advertisement:
-                shop.advertisement_image_url = None
-                shop.advertisement_start_date = None
-                shop.advertisement_end_date = None
-                shop.is_advertisement_active = False
-            elif shop.has_advertisement and not shop.advertisement_image_url:
-                shop.has_advertisement = False
-                shop.is_advertisement_active = False
+
+    # Advertisement image, dates and flag are owned by the advertisement
+    # endpoints; here the flag can only be switched off, which clears the rest
+    values = {k: v for k, v in update_data.items() if k not in AD_FIELDS}
+    if 'has_advertisement' in update_data:
+        if not update_data['has_advertisement']:
+            values.update(
+                has_advertisement=False,
+                advertisement_image_url=None,
+                advertisement_start_date=None,
+                advertisement_end_date=None,
+                is_advertisement_active=False
+            )
         else:
-            setattr(shop, field, value)
-    
-    # Handle time fields with validation
-    if 'opening_time' in update_data or 'closing_time' in update_data:
-        new_opening_time = update_data.get('opening_time', shop.opening_time)
-        new_closing_time = update_data.get('closing_time', shop.closing_time)
-        
-        # Update the time fields
-        shop.opening_time = new_opening_time
-        shop.closing_time = new_closing_time
-        
-        logger.debug(
-            f"Updated shop hours - Opening: {format_time(new_opening_time)}, "
-            f"Closing: {format_time(new_closing_time)}"
-        )
-    
+            # An advertisement cannot be enabled without an uploaded image
+            no_image = models.Shop.advertisement_image_url.is_(None)
+            values.update(
+                has_advertisement=case((no_image, False), else_=True),
+                is_advertisement_active=case(
+                    (no_image, False),
+                    else_=values.get('is_advertisement_active', models.Shop.is_advertisement_active)
+                )
+            )
+
+    owned = (
+        models.Shop.id == shop_id,
+        models.Shop.owner_id == current_user.id
+    )
     try:
-        db.add(shop)
-        db.commit()
-        db.refresh(shop)
-        
+        # One UPDATE ... RETURNING instead of per-field setattr and a refresh
+        if values:
+            shop = db.execute(
+                update(models.Shop)
+                .where(*owned)
+                .values(**values)
+                .returning(models.Shop)
+            ).scalar_one_or_none()
+        else:
+            shop = db.execute(select(models.Shop).where(*owned)).scalar_one_or_none()
+        if not shop:
+            raise HTTPException(status_code=404, detail="Shop not found")
+
+        if 'opening_time' in values or 'closing_time' in values:
+            logger.debug(
+                "Updated shop hours - Opening: %s, Closing: %s",
+                shop.opening_time, shop.closing_time
+            )
+
         # Add computed fields
         shop.is_open = is_shop_open(shop)
         shop.estimated_wait_time = calculate_wait_time(db, shop.id)
-        shop.formatted_hours = f"{format_time(shop.opening_time)} - {format_time(shop.closing_time)}"
-        
-        return shop
+
+        # Build the response before commit expires the returned instance
+        response = schemas.ShopResponse.model_validate(shop)
+        db.commit()
+        return response
+
+    except HTTPException:
+        raise
         
     except Exception as e:
         db.rollback()
@@ -175,12 +357,16 @@ def update_shop(
 @router.delete("/shops/{shop_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_shop(
     shop_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_shop_owner)
 ):
     """Delete a shop and all its related data"""
-    # Verify shop ownership
-    shop = db.query(models.Shop).filter(
+    # Verify shop ownership; the ORM delete needs the instance for its
+    # cascades, but the only column read here is the advertisement image
+    shop = db.query(models.Shop).options(
+        load_only(models.Shop.advertisement_image_url)
+    ).filter(
         models.Shop.id == shop_id,
         models.Shop.owner_id == current_user.id
     ).first()
@@ -189,15 +375,18 @@ def delete_shop(
         raise HTTPException(status_code=404, detail="Shop not found")
     
     try:
-        # Delete advertisement image if exists
-        if shop.advertisement_image_url:
-            file_path = os.path.join("static", shop.advertisement_image_url.lstrip('/'))
-            if os.path.exists(file_path):
-                os.remove(file_path)
-        
+        advertisement_image_url = shop.advertisement_image_url
+
         # Delete the shop (cascading will handle related records)
         db.delete(shop)
         db.commit()
+        _forget_shop_owner(shop_id, current_user.id)
+
+        # Delete advertisement image after the response is sent
+        if advertisement_image_url:
+            background_tasks.add_task(
+                _remove_file, _advertisement_file_path(advertisement_image_url)
+            )
         return
         
     except Exception as e:
@@ -216,15 +405,23 @@ def add_barber(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_shop_owner)
 ):
-    shop = db.query(models.Shop).filter(
-        models.Shop.id == shop_id,
-        models.Shop.owner_id == current_user.id
-    ).first()
-    if not shop:
-        raise HTTPException(status_code=404, detail="Shop not found")
+    _assert_shop_owned(db, shop_id, current_user.id, fresh=True)
+
+    # Find the users holding the email or phone number in one query
+    matches = db.query(models.User).filter(
+        or_(
+            func.lower(models.User.email) == barber_in.email.lower(),
+            models.User.phone_number == barber_in.phone_number
+        )
+    ).all()
+    user = next(
+        (u for u in matches if u.email and u.email.lower() == barber_in.email.lower()),
+        None
+    )
+    if any(u is not user for u in matches if u.phone_number == barber_in.phone_number):
+        raise HTTPException(status_code=400, detail="Phone number is already in use")
 
     # Find or create the user to assign as a barber
-    user = db.query(models.User).filter(models.User.email == barber_in.email).first()
     if not user:
         # Create a new user account with default or provided password
         password = barber_in.password if barber_in.password else "Temp1234"
@@ -238,8 +435,6 @@ def add_barber(
             is_active=True,
         )
         db.add(user)
-        db.commit()
-        db.refresh(user)
     else:
         # User exists
         if user.role != models.UserRole.USER:
@@ -248,31 +443,33 @@ def add_barber(
         user.role = models.UserRole.BARBER
         if barber_in.password:  # Update password if provided
             user.hashed_password = get_password_hash(barber_in.password)
-        db.add(user)
-        db.commit()
 
-    # Create barber profile with status
-    new_barber = models.Barber(
-        user_id=user.id,
-        shop_id=shop.id,
-        status=barber_in.status or models.BarberStatus.AVAILABLE
-    )
-    db.add(new_barber)
+    # Create barber profile with status; user and barber commit together so a
+    # failure cannot leave a barber-role user without a barber profile
+    try:
+        # Flushing the user first provides user_id; assigning Barber.user
+        # instead would load the barber_profile backref of an existing user
+        db.flush()
+        new_barber = models.Barber(
+            user_id=user.id,
+            shop_id=shop_id,
+            status=barber_in.status or models.BarberStatus.AVAILABLE
+        )
+        db.add(new_barber)
+        db.flush()
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=_integrity_error_detail(
+                e, "User with this email or phone number already exists"
+            )
+        )
+
+    # Create response with all required fields before commit
+    response_data = _barber_response(new_barber, user)
     db.commit()
-    db.refresh(new_barber)
-
-    # Create response dictionary with all required fields
-    response_data = {
-        "id": new_barber.id,
-        "user_id": user.id,
-        "shop_id": shop.id,
-        "status": new_barber.status,
-        "full_name": user.full_name,
-        "email": user.email,
-        "phone_number": user.phone_number,
-        "is_active": user.is_active
-    }
-    
+
     return response_data
 
 
@@ -286,20 +483,16 @@ def update_barber(
 ):
     """Update barber details"""
     # First, verify shop ownership
-    shop = db.query(models.Shop).filter(
-        models.Shop.id == shop_id,
-        models.Shop.owner_id == current_user.id
-    ).first()
-    if not shop:
-        raise HTTPException(status_code=404, detail="Shop not found")
+    _assert_shop_owned(db, shop_id, current_user.id, fresh=True)
 
     # Add logging to debug the query
-    logger.debug(f"Looking for barber with id {barber_id} in shop {shop_id}")
+    logger.debug("Looking for barber with id %s in shop %s", barber_id, shop_id)
     
-    # Get barber with a join to ensure we have all related data
+    # Get barber and its user in a single query
     barber = (
         db.query(models.Barber)
-        .join(models.User)
+        .join(models.Barber.user)
+        .options(contains_eager(models.Barber.user))
         .filter(
             models.Barber.id == barber_id,
             models.Barber.shop_id == shop_id  # Changed from shop.id to shop_id
@@ -308,11 +501,11 @@ def update_barber(
     )
     
     # Add debug logging
-    logger.debug(f"Barber query result: {barber}")
+    logger.debug("Barber query result: %s", barber)
     
     if not barber:
         # Add more detailed error information
-        existing_barber = db.query(models.Barber).filter(models.Barber.id == barber_id).first()
+        existing_barber = db.get(models.Barber, barber_id)
         if existing_barber:
             logger.error(f"Barber exists but in different shop. Barber shop_id: {existing_barber.shop_id}, Requested shop_id: {shop_id}")
             raise HTTPException(
@@ -343,27 +536,21 @@ def update_barber(
     if barber_in.status is not None:
         barber.status = barber_in.status
 
+    # Create response with all required fields before commit expires them
+    response_data = _barber_response(barber, user)
+
     try:
-        db.add(user)
-        db.add(barber)
         db.commit()
-        db.refresh(barber)
-        db.refresh(user)
-
-        # Create response with all required fields
-        response_data = {
-            "id": barber.id,
-            "user_id": user.id,
-            "shop_id": shop_id,
-            "status": barber.status,
-            "full_name": user.full_name,
-            "email": user.email,
-            "phone_number": user.phone_number,
-            "is_active": user.is_active
-        }
-        
         return response_data
-        
+
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=_integrity_error_detail(
+                e, "User with this email or phone number already exists"
+            )
+        )
     except Exception as e:
         db.rollback()
         logger.error(f"Error updating barber: {str(e)}")
@@ -375,50 +562,17 @@ def update_barber(
 
 @router.patch("/shops/{shop_id}/barbers/{barber_id}/status", response_model=schemas.BarberResponse)
 def update_barber_status(
-    shop_id: int,
-    barber_id: int,
     status: models.BarberStatus,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_shop_owner)
+    barber: models.Barber = Depends(get_owned_barber)
 ):
     """Update barber status only"""
-    shop = db.query(models.Shop).filter(
-        models.Shop.id == shop_id,
-        models.Shop.owner_id == current_user.id
-    ).first()
-    if not shop:
-        raise HTTPException(status_code=404, detail="Shop not found")
-
-    # Join with User table to get all required information
-    barber = (
-        db.query(models.Barber)
-        .join(models.User)
-        .filter(
-            models.Barber.id == barber_id,
-            models.Barber.shop_id == shop.id
-        )
-        .first()
-    )
-    if not barber:
-        raise HTTPException(status_code=404, detail="Barber not found")
-
     barber.status = status
-    db.add(barber)
+
+    # Create response with all required fields before commit expires them
+    response_data = _barber_response(barber, barber.user)
     db.commit()
-    db.refresh(barber)
-
-    # Create response with all required fields
-    response_data = {
-        "id": barber.id,
-        "user_id": barber.user_id,
-        "shop_id": barber.shop_id,
-        "status": barber.status,
-        "full_name": barber.user.full_name,
-        "email": barber.user.email,
-        "phone_number": barber.user.phone_number,
-        "is_active": barber.user.is_active
-    }
-    
+
     return response_data
 
 
@@ -428,37 +582,28 @@ def get_barbers(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_shop_owner)
 ):
-    shop = db.query(models.Shop).filter(
-        models.Shop.id == shop_id,
-        models.Shop.owner_id == current_user.id
-    ).first()
-    if not shop:
-        raise HTTPException(status_code=404, detail="Shop not found")
+    _assert_shop_owned(db, shop_id, current_user.id)
 
-    # Join with User table to get all required information
+    # Load each barber's user through the same join so building the
+    # response does not issue one SELECT per barber
     barbers = (
         db.query(models.Barber)
-        .join(models.User)
-        .filter(models.Barber.shop_id == shop.id)
+        .join(models.Barber.user)
+        .options(
+            contains_eager(models.Barber.user).load_only(
+                models.User.full_name,
+                models.User.email,
+                models.User.phone_number,
+                models.User.is_active
+            ),
+            raiseload('*')
+        )
+        .filter(models.Barber.shop_id == shop_id)
         .all()
     )
 
     # Create response objects with combined barber and user information
-    barber_responses = []
-    for barber in barbers:
-        response_dict = {
-            "id": barber.id,
-            "user_id": barber.user_id,
-            "shop_id": barber.shop_id,
-            "status": barber.status,
-            "full_name": barber.user.full_name,
-            "email": barber.user.email,
-            "phone_number": barber.user.phone_number,
-            "is_active": barber.user.is_active
-        }
-        barber_responses.append(response_dict)
-
-    return barber_responses
+    return [_barber_response(barber, barber.user) for barber in barbers]
 
 
 @router.delete("/shops/barbers/{barber_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -467,25 +612,43 @@ def remove_barber(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_shop_owner)
 ):
-    shop = db.query(models.Shop).filter(models.Shop.owner_id == current_user.id).first()
-    if not shop:
-        raise HTTPException(status_code=404, detail="Shop not found")
-
-    barber = db.query(models.Barber).filter(
-        models.Barber.id == barber_id,
-        models.Barber.shop_id == shop.id
-    ).first()
-    if not barber:
+    # Demote the barber's user back to USER; the subquery only matches a
+    # barber in one of the owner's shops, so no row means not found
+    owned_barber_user_id = (
+        select(models.Barber.user_id)
+        .join(models.Barber.shop)
+        .where(
+            models.Barber.id == barber_id,
+            models.Shop.owner_id == current_user.id
+        )
+        .scalar_subquery()
+    )
+    result = db.execute(
+        update(models.User)
+        .where(models.User.id == owned_barber_user_id)
+        .values(role=models.UserRole.USER)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Barber not found")
 
-    # Update user's role back to USER
-    user = db.query(models.User).filter(models.User.id == barber.user_id).first()
-    if user:
-        user.role = models.UserRole.USER
-        db.add(user)
-
-    db.delete(barber)
+    # Same cascade as the Barber relationships, as set-based deletes so the
+    # barber's appointments, feedback and schedules are never loaded
+    for statement in (
+        delete(models.Appointment).where(models.Appointment.barber_id == barber_id),
+        delete(models.Feedback).where(models.Feedback.barber_id == barber_id),
+        delete(models.BarberSchedule).where(models.BarberSchedule.barber_id == barber_id),
+        delete(models.barber_services).where(models.barber_services.c.barber_id == barber_id),
+    ):
+        db.execute(statement.execution_options(synchronize_session=False))
+    shop_id = db.execute(
+        delete(models.Barber)
+        .where(models.Barber.id == barber_id)
+        .returning(models.Barber.shop_id)
+        .execution_options(synchronize_session=False)
+    ).scalar_one()
     db.commit()
+    invalidate_wait_time(shop_id)
     return
 
 
@@ -498,18 +661,13 @@ def create_service(
     current_user: models.User = Depends(get_current_shop_owner)
 ):
     """Create a new service for a shop"""
-    shop = db.query(models.Shop).filter(
-        models.Shop.id == shop_id,
-        models.Shop.owner_id == current_user.id
-    ).first()
-    if not shop:
-        raise HTTPException(status_code=404, detail="Shop not found")
+    _assert_shop_owned(db, shop_id, current_user.id, fresh=True)
 
     new_service = models.Service(
         name=service_in.name,
         duration=service_in.duration,
         price=service_in.price,
-        shop_id=shop.id
+        shop_id=shop_id
     )
     db.add(new_service)
     db.commit()
@@ -524,14 +682,11 @@ def get_services(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_shop_owner)
 ):
-    shop = db.query(models.Shop).filter(
-        models.Shop.id == shop_id,
-        models.Shop.owner_id == current_user.id
-    ).first()
-    if not shop:
-        raise HTTPException(status_code=404, detail="Shop not found")
+    _assert_shop_owned(db, shop_id, current_user.id)
 
-    services = db.query(models.Service).filter(models.Service.shop_id == shop.id).all()
+    services = db.query(models.Service).options(raiseload('*')).filter(
+        models.Service.shop_id == shop_id
+    ).all()
     return services
 
 
@@ -544,27 +699,29 @@ def update_service(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_shop_owner)
 ):
-    shop = db.query(models.Shop).filter(
-        models.Shop.id == shop_id,
-        models.Shop.owner_id == current_user.id
-    ).first()
-    if not shop:
-        raise HTTPException(status_code=404, detail="Shop not found")
-
-    service = db.query(models.Service).filter(
-        models.Service.id == service_id,
-        models.Service.shop_id == shop.id
-    ).first()
+    # Only the fields the client sent; every service column is NOT NULL
+    update_data = service_in.model_dump(exclude_unset=True, exclude_none=True)
+    if not update_data:
+        raise HTTPException(status_code=400, detail="No fields to update")
+
+    # Single UPDATE ... RETURNING with the ownership check folded into it
+    service = db.execute(
+        update(models.Service)
+        .where(
+            models.Service.id == service_id,
+            models.Service.shop_id == shop_id,
+            _owned_shop_clause(shop_id, current_user.id)
+        )
+        .values(**update_data)
+        .returning(models.Service)
+    ).scalar_one_or_none()
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
 
-    for var, value in vars(service_in).items():
-        if value is not None:
-            setattr(service, var, value)
-    db.add(service)
+    # Build the response before commit expires the returned instance
+    response = schemas.ServiceResponse.model_validate(service)
     db.commit()
-    db.refresh(service)
-    return service
+    return response
 
 
 @router.delete("/shops/services/{service_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -573,19 +730,19 @@ def delete_service(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_shop_owner)
 ):
-    shop = db.query(models.Shop).filter(models.Shop.owner_id == current_user.id).first()
-    if not shop:
-        raise HTTPException(status_code=404, detail="Shop not found")
-
-    service = db.query(models.Service).filter(
+    # Ownership is checked in the same query, across all of the owner's shops
+    service = db.query(models.Service).join(models.Shop).filter(
         models.Service.id == service_id,
-        models.Service.shop_id == shop.id
+        models.Shop.owner_id == current_user.id
     ).first()
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
 
+    # ORM delete keeps the appointment/queue entry cascades
+    shop_id = service.shop_id
     db.delete(service)
     db.commit()
+    invalidate_wait_time(shop_id)
     return
 
 
@@ -595,16 +752,17 @@ def get_queue(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_shop_owner)
 ):
-    shop = db.query(models.Shop).filter(
-        models.Shop.id == shop_id,
-        models.Shop.owner_id == current_user.id
-    ).first()
-    if not shop:
-        raise HTTPException(status_code=404, detail="Shop not found")
-
-    queue_entries = db.query(models.QueueEntry).filter(
-        models.QueueEntry.shop_id == shop.id,
-        models.QueueEntry.status.in_([models.QueueStatus.CHECKED_IN, models.QueueStatus.ARRIVED])
+    _assert_shop_owned(db, shop_id, current_user.id)
+
+    # selectinload batches barbers and their users into one IN query each
+    queue_entries = db.query(models.QueueEntry).options(
+        selectinload(models.QueueEntry.barber)
+        .selectinload(models.Barber.user)
+        .load_only(models.User.full_name),
+        raiseload('*')
+    ).filter(
+        models.QueueEntry.shop_id == shop_id,
+        models.QueueEntry.status.in_(ACTIVE_QUEUE_STATUSES)
     ).order_by(models.QueueEntry.check_in_time).all()
     return queue_entries
 
@@ -617,26 +775,28 @@ def update_queue_entry(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_shop_owner)
 ):
-    shop = db.query(models.Shop).filter(
-        models.Shop.id == shop_id,
-        models.Shop.owner_id == current_user.id
-    ).first()
-    if not shop:
-        raise HTTPException(status_code=404, detail="Shop not found")
-
+    # Ownership is checked in the same query as the entry lookup
     queue_entry = db.query(models.QueueEntry).filter(
         models.QueueEntry.id == queue_id,
-        models.QueueEntry.shop_id == shop.id
+        models.QueueEntry.shop_id == shop_id,
+        _owned_shop_clause(shop_id, current_user.id)
     ).first()
     if not queue_entry:
         raise HTTPException(status_code=404, detail="Queue entry not found")
 
-    queue_entry.status = status_update.status
-    if queue_entry.status == models.QueueStatus.IN_SERVICE:
+    try:
+        new_status = models.QueueStatus(status_update.status)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid queue status")
+
+    queue_entry.status = new_status
+    if new_status is models.QueueStatus.IN_SERVICE:
         queue_entry.service_start_time = datetime.utcnow()
-    elif queue_entry.status == models.QueueStatus.COMPLETED:
+    elif new_status is models.QueueStatus.COMPLETED:
         queue_entry.service_end_time = datetime.utcnow()
-    db.add(queue_entry)
+
+    # Commit before building the response so a serialization error cannot
+    # lose the status change
     db.commit()
     db.refresh(queue_entry)
     return queue_entry
@@ -648,15 +808,23 @@ def get_shop_appointments(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_shop_owner)
 ):
-    shop = db.query(models.Shop).filter(
-        models.Shop.id == shop_id,
-        models.Shop.owner_id == current_user.id
-    ).first()
-    if not shop:
-        raise HTTPException(status_code=404, detail="Shop not found")
-
-    appointments = db.query(models.Appointment).filter(
-        models.Appointment.shop_id == shop.id
+    _assert_shop_owned(db, shop_id, current_user.id)
+
+    # Only the columns AppointmentResponse reads
+    appointments = db.query(models.Appointment).options(
+        load_only(
+            models.Appointment.id,
+            models.Appointment.shop_id,
+            models.Appointment.barber_id,
+            models.Appointment.service_id,
+            models.Appointment.appointment_time,
+            models.Appointment.number_of_people,
+            models.Appointment.status,
+            models.Appointment.created_at
+        ),
+        raiseload('*')
+    ).filter(
+        models.Appointment.shop_id == shop_id
     ).all()
     return appointments
 
@@ -667,15 +835,20 @@ def get_shop_feedback(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_shop_owner)
 ):
-    shop = db.query(models.Shop).filter(
-        models.Shop.id == shop_id,
-        models.Shop.owner_id == current_user.id
-    ).first()
-    if not shop:
-        raise HTTPException(status_code=404, detail="Shop not found")
-
-    feedbacks = db.query(models.Feedback).filter(
-        models.Feedback.shop_id == shop.id
+    _assert_shop_owned(db, shop_id, current_user.id)
+
+    # Only the columns FeedbackResponse reads
+    feedbacks = db.query(models.Feedback).options(
+        load_only(
+            models.Feedback.id,
+            models.Feedback.user_id,
+            models.Feedback.shop_id,
+            models.Feedback.rating,
+            models.Feedback.created_at
+        ),
+        raiseload('*')
+    ).filter(
+        models.Feedback.shop_id == shop_id
     ).all()
     return feedbacks
 
@@ -687,34 +860,35 @@ def get_daily_report(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_shop_owner)
 ):
-    shop = db.query(models.Shop).filter(
-        models.Shop.id == shop_id,
-        models.Shop.owner_id == current_user.id
-    ).first()
-    if not shop:
-        raise HTTPException(status_code=404, detail="Shop not found")
+    _assert_shop_owned(db, shop_id, current_user.id)
 
     if not date:
         date = datetime.utcnow().date()
 
-    total_customers = db.query(models.Appointment).filter(
-        models.Appointment.shop_id == shop.id,
+    # Count and average wait (scheduled time -> actual start) in one query
+    total_customers, average_wait_seconds = db.query(
+        func.count(models.Appointment.id),
+        func.avg(
+            extract(
+                'epoch',
+                models.Appointment.actual_start_time - models.Appointment.appointment_time
+            )
+        )
+    ).filter(
+        models.Appointment.shop_id == shop_id,
         models.Appointment.appointment_time >= date,
         models.Appointment.appointment_time < date + timedelta(days=1)
-    ).count()
-
-    # Placeholder for actual calculation
-    average_wait_time = 0  
+    ).one()
 
     report = schemas.DailyReportResponse(
         date=date,
         total_customers=total_customers,
-        average_wait_time=average_wait_time
+        average_wait_time=float(average_wait_seconds or 0) / 60
     )
     return report
 
 @router.post("/shops/{shop_id}/advertisement", response_model=schemas.ShopResponse)
-async def upload_advertisement(
+def upload_advertisement(
     shop_id: int,
     file: UploadFile = File(...),
     start_date: datetime = Form(None),  # Changed to Form
@@ -732,39 +906,49 @@ async def upload_advertisement(
     if not shop:
         raise HTTPException(status_code=404, detail="Shop not found")
 
-    # Validate file type
-    if not file.content_type.startswith('image/'):
+    # Validate file type; the extension comes from the whitelist, never the client filename
+    file_extension = ADVERTISEMENT_EXTENSIONS.get(file.content_type)
+    if not file_extension:
         raise HTTPException(
             status_code=400,
-            detail="Only image files are allowed"
+            detail="Only PNG, JPEG, WebP and GIF images are allowed"
         )
 
     # Generate unique filename
-    file_extension = os.path.splitext(file.filename)[1]
-    unique_filename = f"{uuid.uuid4()}{file_extension}"
+    unique_filename = uuid.uuid4().hex + file_extension
     file_path = os.path.join(UPLOAD_DIR, unique_filename)
     
-    # Save the file
-    async with aiofiles.open(file_path, 'wb') as out_file:
-        content = await file.read()
-        await out_file.write(content)
+    # Save the file in chunks; this runs in the threadpool, like the database calls
+    size = 0
+    with open(file_path, 'wb') as out_file:
+        while chunk := file.file.read(UPLOAD_BUFFER_SIZE):
+            size += len(chunk)
+            if size > MAX_ADVERTISEMENT_SIZE:
+                break
+            out_file.write(chunk)
+    if size > MAX_ADVERTISEMENT_SIZE:
+        _remove_file(file_path)
+        raise HTTPException(
+            status_code=413,
+            detail="Advertisement image must not exceed 5 MB"
+        )
 
     # Update shop with advertisement details
     shop.has_advertisement = True
     shop.advertisement_image_url = f"/static/advertisements/{unique_filename}"
-    shop.advertisement_start_date = start_date if start_date else datetime.utcnow()
-    shop.advertisement_end_date = end_date
+    shop.advertisement_start_date = _naive_utc(start_date) if start_date else datetime.utcnow()
+    shop.advertisement_end_date = _naive_utc(end_date)
     shop.is_advertisement_active = True
 
-    db.add(shop)
+    # Every returned field is known; build the response instead of refreshing
+    response = schemas.ShopResponse.model_validate(shop)
     db.commit()
-    db.refresh(shop)
-    
-    return shop
+    return response
 
 @router.delete("/shops/{shop_id}/advertisement", response_model=schemas.ShopResponse)
-async def remove_advertisement(
+def remove_advertisement(
     shop_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_shop_owner)
 ):
@@ -777,11 +961,11 @@ async def remove_advertisement(
     if not shop:
         raise HTTPException(status_code=404, detail="Shop not found")
 
-    # Delete the image file if it exists
+    # Delete the image file off the event loop, after the response is sent
     if shop.advertisement_image_url:
-        file_path = os.path.join("static", shop.advertisement_image_url.lstrip('/'))
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        background_tasks.add_task(
+            _remove_file, _advertisement_file_path(shop.advertisement_image_url)
+        )
 
     # Reset advertisement fields
     shop.has_advertisement = False
@@ -790,11 +974,10 @@ async def remove_advertisement(
     shop.advertisement_end_date = None
     shop.is_advertisement_active = False
 
-    db.add(shop)
+    # Every returned field is known; build the response instead of refreshing
+    response = schemas.ShopResponse.model_validate(shop)
     db.commit()
-    db.refresh(shop)
-    
-    return shop
+    return response
 
 @router.post("/shops/{shop_id}/barbers/{barber_id}/services", response_model=schemas.BarberResponse)
 def assign_services_to_barber(
@@ -805,25 +988,27 @@ def assign_services_to_barber(
     current_user: models.User = Depends(get_current_shop_owner)
 ):
     """Assign services to a barber"""
-    # Verify shop ownership and get barber
-    shop = db.query(models.Shop).filter(
-        models.Shop.id == shop_id,
-        models.Shop.owner_id == current_user.id
-    ).first()
-    if not shop:
-        raise HTTPException(status_code=404, detail="Shop not found")
-
-    barber = db.query(models.Barber).filter(
-        models.Barber.id == barber_id,
-        models.Barber.shop_id == shop.id
-    ).first()
+    # Ownership, the barber's user and current services in one round-trip
+    barber = db.execute(
+        select(models.Barber)
+        .join(models.Barber.shop)
+        .options(
+            joinedload(models.Barber.user),
+            selectinload(models.Barber.services)
+        )
+        .where(
+            models.Barber.id == barber_id,
+            models.Barber.shop_id == shop_id,
+            models.Shop.owner_id == current_user.id
+        )
+    ).scalar_one_or_none()
     if not barber:
         raise HTTPException(status_code=404, detail="Barber not found")
 
     # Verify all services exist and belong to the shop
     new_services = db.query(models.Service).filter(
         models.Service.id.in_(service_ids),
-        models.Service.shop_id == shop.id
+        models.Service.shop_id == shop_id
     ).all()
 
     if len(new_services) != len(service_ids):
@@ -832,193 +1017,123 @@ def assign_services_to_barber(
             detail="One or more services not found or don't belong to this shop"
         )
 
-    # Check for duplicates to avoid adding the same service twice
-    existing_service_ids = {service.id for service in barber.services}
-    
-    # Add only new services that aren't already assigned
-    for service in new_services:
-        if service.id not in existing_service_ids:
-            barber.services.append(service)
+    # Insert only the missing assignments in one INSERT ... SELECT; the
+    # database skips services the barber already has
+    db.execute(
+        insert(models.barber_services).from_select(
+            ['barber_id', 'service_id'],
+            select(literal(barber.id), models.Service.id).where(
+                models.Service.id.in_(service_ids),
+                models.Service.shop_id == shop_id,
+                ~exists().where(
+                    models.barber_services.c.barber_id == barber.id,
+                    models.barber_services.c.service_id == models.Service.id
+                )
+            )
+        )
+    )
+
+    # Existing plus newly assigned services, without reloading the collection
+    services = {service.id: service for service in barber.services}
+    services.update((service.id, service) for service in new_services)
 
-    db.add(barber)
+    # Build the response before commit expires the loaded rows
+    response = _barber_response(
+        barber,
+        barber.user,
+        [schemas.ServiceResponse.model_validate(s) for s in services.values()]
+    )
     db.commit()
-    db.refresh(barber)
-
-    # Create response with all required fields
-    response_data = {
-        "id": barber.id,
-        "user_id": barber.user.id,
-        "shop_id": barber.shop_id,
-        "status": barber.status,
-        "full_name": barber.user.full_name,
-        "email": barber.user.email,
-        "phone_number": barber.user.phone_number,
-        "is_active": barber.user.is_active,
-        "services": [{
-            "id": s.id,
-            "name": s.name,
-            "duration": s.duration,
-            "price": s.price,
-            "shop_id": s.shop_id
-        } for s in barber.services]
-    }
-    
-    return response_data
+    return response
 
 @router.delete("/shops/{shop_id}/barbers/{barber_id}/services/{service_id}", status_code=status.HTTP_204_NO_CONTENT)
 def remove_service_from_barber(
     shop_id: int,
-    barber_id: int,
     service_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_shop_owner)
+    barber: models.Barber = Depends(get_owned_barber)
 ):
     """Remove a service from a barber's list of services"""
-    # Verify shop ownership and get barber
-    shop = db.query(models.Shop).filter(
-        models.Shop.id == shop_id,
-        models.Shop.owner_id == current_user.id
-    ).first()
-    if not shop:
-        raise HTTPException(status_code=404, detail="Shop not found")
-
-    barber = db.query(models.Barber).filter(
-        models.Barber.id == barber_id,
-        models.Barber.shop_id == shop.id
-    ).first()
-    if not barber:
-        raise HTTPException(status_code=404, detail="Barber not found")
-
     # Verify service exists and belongs to the shop
-    service = db.query(models.Service).filter(
-        models.Service.id == service_id,
-        models.Service.shop_id == shop.id
-    ).first()
-    if not service:
+    service = db.get(models.Service, service_id)
+    if service is None or service.shop_id != shop_id:
         raise HTTPException(status_code=404, detail="Service not found")
 
-    # Remove service from barber's services
-    barber.services.remove(service)
-    db.add(barber)
+    # Delete the association row directly instead of loading barber.services
+    result = db.execute(
+        models.barber_services.delete().where(
+            models.barber_services.c.barber_id == barber.id,
+            models.barber_services.c.service_id == service.id
+        )
+    )
+    if result.rowcount == 0:
+        raise HTTPException(status_code=404, detail="Service not assigned to barber")
     db.commit()
 
 @router.get("/shops/{shop_id}/barbers/{barber_id}/services", response_model=List[schemas.ServiceResponse])
 def get_barber_services(
-    shop_id: int,
-    barber_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_shop_owner)
+    barber: models.Barber = Depends(get_owned_barber)
 ):
     """Get all services assigned to a barber"""
-    # Verify shop ownership and get barber
-    shop = db.query(models.Shop).filter(
-        models.Shop.id == shop_id,
-        models.Shop.owner_id == current_user.id
-    ).first()
-    if not shop:
-        raise HTTPException(status_code=404, detail="Shop not found")
-
-    barber = db.query(models.Barber).filter(
-        models.Barber.id == barber_id,
-        models.Barber.shop_id == shop.id
-    ).first()
-    if not barber:
-        raise HTTPException(status_code=404, detail="Barber not found")
-
-    return barber.services
+    # raiseload turns any relationship access during serialization into an error
+    return db.query(models.Service).options(raiseload('*')).filter(
+        with_parent(barber, models.Barber.services)
+    ).all()
 
 @router.post(
     "/shops/{shop_id}/barbers/{barber_id}/schedules/", 
     response_model=schemas.BarberScheduleResponse
 )
 def create_barber_schedule(
-    shop_id: int,
-    barber_id: int,
     schedule_in: schemas.BarberScheduleCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_shop_owner)
+    barber: models.Barber = Depends(get_owned_barber)
 ):
     """Create a schedule for a barber in the shop"""
-    # Verify shop ownership and get barber
-    shop = db.query(models.Shop).filter(
-        models.Shop.id == shop_id,
-        models.Shop.owner_id == current_user.id
-    ).first()
-    if not shop:
-        raise HTTPException(status_code=404, detail="Shop not found")
-
-    barber = db.query(models.Barber).filter(
-        models.Barber.id == barber_id,
-        models.Barber.shop_id == shop.id
-    ).first()
-    if not barber:
-        raise HTTPException(status_code=404, detail="Barber not found")
-
-    # Check if schedule already exists for this day
-    existing_schedule = db.query(models.BarberSchedule).filter(
-        models.BarberSchedule.barber_id == barber.id,
-        models.BarberSchedule.day_of_week == schedule_in.day_of_week
-    ).first()
-    
-    if existing_schedule:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Schedule already exists for day {schedule_in.day_of_week}"
-        )
-
     # No need to convert start_time and end_time; they are already time objects
     new_schedule = models.BarberSchedule(
-        barber_id=barber.id,
+        barber=barber,
         day_of_week=schedule_in.day_of_week,
         start_time=schedule_in.start_time,
         end_time=schedule_in.end_time
     )
 
     db.add(new_schedule)
-    db.commit()
-    db.refresh(new_schedule)
-
-    # Ensure the 'barber' relationship is loaded
-    _ = new_schedule.barber  # Accessing to load the relationship
+    try:
+        db.flush()
+    except IntegrityError:
+        # uix_barber_day allows one schedule per barber per day
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Schedule already exists for day {schedule_in.day_of_week}"
+        )
 
-    # Return the response using Pydantic's model_validate
-    return schemas.BarberScheduleResponse.model_validate(new_schedule)
+    # Build the response before commit expires the schedule and its barber,
+    # so neither has to be reloaded
+    response = schemas.BarberScheduleResponse.model_validate(new_schedule)
+    db.commit()
+    return response
 
 
 
 @router.get("/shops/{shop_id}/barbers/{barber_id}/schedules/", response_model=List[schemas.BarberScheduleResponse])
 def get_barber_schedules(
-    shop_id: int,
-    barber_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_shop_owner)
+    barber: models.Barber = Depends(get_owned_barber)
 ):
     """Get all schedules for a barber"""
-    # Verify shop ownership
-    shop = db.query(models.Shop).filter(
-        models.Shop.id == shop_id,
-        models.Shop.owner_id == current_user.id
-    ).first()
-    if not shop:
-        raise HTTPException(status_code=404, detail="Shop not found")
-
-    # Verify barber exists in the shop
-    barber = db.query(models.Barber).filter(
-        models.Barber.id == barber_id,
-        models.Barber.shop_id == shop.id
-    ).first()
-    if not barber:
-        raise HTTPException(status_code=404, detail="Barber not found")
-
-    # Eagerly load the barber relationship to access shop_id
+    # No join needed: schedule.barber resolves from the identity map, where
+    # get_owned_barber already loaded this barber; anything needing SQL raises
     schedules = db.query(models.BarberSchedule).options(
-        joinedload(models.BarberSchedule.barber)
+        raiseload('*', sql_only=True)
     ).filter(
         models.BarberSchedule.barber_id == barber.id
     ).all()
 
-    # Convert schedules to response format using Pydantic's model_validate (Pydantic v2)
-    return [schemas.BarberScheduleResponse.model_validate(schedule) for schedule in schedules]
+    # Convert schedules to response format in a single validation pass
+    return schemas.BarberScheduleListAdapter.validate_python(schedules)
 
 
 @router.put(
@@ -1026,97 +1141,49 @@ def get_barber_schedules(
     response_model=schemas.BarberScheduleResponse
 )
 def update_barber_schedule(
-    shop_id: int,
-    barber_id: int,
     schedule_id: int,
     schedule_update: schemas.BarberScheduleUpdate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_shop_owner)
+    barber: models.Barber = Depends(get_owned_barber)
 ):
     """Update a barber's schedule"""
-    # Verify shop ownership and get barber
-    shop = db.query(models.Shop).filter(
-        models.Shop.id == shop_id,
-        models.Shop.owner_id == current_user.id
-    ).first()
-    if not shop:
-        raise HTTPException(status_code=404, detail="Shop not found")
-
-    barber = db.query(models.Barber).filter(
-        models.Barber.id == barber_id,
-        models.Barber.shop_id == shop.id
-    ).first()
-    if not barber:
-        raise HTTPException(status_code=404, detail="Barber not found")
+    # Only the fields the client sent; every schedule column is NOT NULL
+    update_data = schedule_update.model_dump(exclude_unset=True, exclude_none=True)
+    if not update_data:
+        raise HTTPException(status_code=400, detail="No fields to update")
 
-    schedule = db.query(models.BarberSchedule).filter(
-        models.BarberSchedule.id == schedule_id,
-        models.BarberSchedule.barber_id == barber.id
-    ).first()
+    # Single UPDATE ... RETURNING instead of SELECT, then UPDATE on flush
+    try:
+        schedule = db.execute(
+            update(models.BarberSchedule)
+            .where(
+                models.BarberSchedule.id == schedule_id,
+                models.BarberSchedule.barber_id == barber.id
+            )
+            .values(**update_data)
+            .returning(models.BarberSchedule)
+        ).scalar_one_or_none()
+    except IntegrityError:
+        # uix_barber_day allows one schedule per barber per day
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Schedule already exists for day {schedule_update.day_of_week}"
+        )
     if not schedule:
         raise HTTPException(status_code=404, detail="Schedule not found")
 
-    # Update schedule fields if provided
-    if schedule_update.start_time is not None:
-        schedule.start_time = schedule_update.start_time
-    if schedule_update.end_time is not None:
-        schedule.end_time = schedule_update.end_time
-    if schedule_update.day_of_week is not None:
-        # Check if schedule already exists for the new day
-        existing_schedule = db.query(models.BarberSchedule).filter(
-            models.BarberSchedule.barber_id == barber.id,
-            models.BarberSchedule.day_of_week == schedule_update.day_of_week,
-            models.BarberSchedule.id != schedule_id
-        ).first()
-        if existing_schedule:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Schedule already exists for day {schedule_update.day_of_week}"
-            )
-        schedule.day_of_week = schedule_update.day_of_week
-
-    db.add(schedule)
+    # Build the response before commit expires the schedule and its barber
+    response = schemas.BarberScheduleResponse.model_validate(schedule)
     db.commit()
-    db.refresh(schedule)
-
-    # Ensure the 'barber' relationship is loaded
-    _ = schedule.barber  # Accessing to load the relationship
-
-    # Return the response using Pydantic's model_validate
-    return schemas.BarberScheduleResponse.model_validate(schedule)
+    return response
 
 @router.delete("/shops/{shop_id}/barbers/{barber_id}/schedules/{schedule_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_barber_schedule(
-    shop_id: int,
-    barber_id: int,
-    schedule_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_shop_owner)
+    schedule: models.BarberSchedule = Depends(get_owned_schedule)
 ):
     """Delete a barber's schedule"""
-    # Verify shop ownership and get barber
-    shop = db.query(models.Shop).filter(
-        models.Shop.id == shop_id,
-        models.Shop.owner_id == current_user.id
-    ).first()
-    if not shop:
-        raise HTTPException(status_code=404, detail="Shop not found")
-
-    barber = db.query(models.Barber).filter(
-        models.Barber.id == barber_id,
-        models.Barber.shop_id == shop.id
-    ).first()
-    if not barber:
-        raise HTTPException(status_code=404, detail="Barber not found")
-
-    schedule = db.query(models.BarberSchedule).filter(
-        models.BarberSchedule.id == schedule_id,
-        models.BarberSchedule.barber_id == barber.id
-    ).first()
-    if not schedule:
-        raise HTTPException(status_code=404, detail="Schedule not found")
-
     db.delete(schedule)
     db.commit()
     return
-
@@ -5,20 +5,28 @@ from sqlalchemy.orm import Session
 from app import models, schemas
 from datetime import timedelta
 from app.core.security import create_access_token
+from app.core.dependencies import get_current_unregistered_user
 from app.database import get_db
 from typing import List
-import random
+import secrets
+import time
 
 router = APIRouter(prefix="/unregistered-users", tags=["Unregistered Users"])
 
+# Phone number -> (code, time it was issued); each code can be used once
 verification_codes = {}
+VERIFICATION_CODE_TTL = 300  # seconds
 
 @router.post("/request-code")
 def request_verification_code(phone_number: str):
     # Generate a random 6-digit code
-    code = random.randint(100000, 999999)
-    # Store it in a dictionary with the phone number as the key
-    verification_codes[phone_number] = code
+    code = 100000 + secrets.randbelow(900000)
+    # Drop codes that expired without being used, then store the new one
+    now = time.monotonic()
+    for phone, (_, issued_at) in list(verification_codes.items()):
+        if now - issued_at >= VERIFICATION_CODE_TTL:
+            verification_codes.pop(phone, None)
+    verification_codes[phone_number] = (code, now)
     # Send the code via SMS (integration with SMS gateway required)
     # For demonstration, we'll just print it
     print(f"Verification code for {phone_number}: {code}")
@@ -26,8 +34,12 @@ def request_verification_code(phone_number: str):
 
 @router.post("/verify-code")
 def verify_code(phone_number: str, code: int):
-    stored_code = verification_codes.get(phone_number)
-    if stored_code != code:
+    stored = verification_codes.pop(phone_number, None)
+    if (
+        stored is None
+        or stored[0] != code
+        or time.monotonic() - stored[1] >= VERIFICATION_CODE_TTL
+    ):
         raise HTTPException(status_code=400, detail="Invalid verification code")
     # Generate a temporary token
     access_token_expires = timedelta(minutes=15)
@@ -36,9 +48,6 @@ def verify_code(phone_number: str, code: int):
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
-
-from app.core.dependencies import get_current_unregistered_user
-
 @router.get("/appointments", response_model=List[schemas.AppointmentResponse])
 def get_appointments(
     current_phone_number: str = Depends(get_current_unregistered_user),
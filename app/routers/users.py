@@ -1,6 +1,7 @@
 # app/routers/users.py
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app import models, schemas
 from app.database import get_db
@@ -13,14 +14,6 @@ router = APIRouter(prefix="/users", tags=["Users"])
 
 @router.post("/", response_model=schemas.UserResponse)
 def create_user(user_in: schemas.UserCreate, db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(
-        (models.User.email == user_in.email) | (models.User.phone_number == user_in.phone_number)
-    ).first()
-    if user:
-        raise HTTPException(
-            status_code=400,
-            detail="User with this email or phone number already exists",
-        )
     hashed_password = get_password_hash(user_in.password)
     new_user = models.User(
         full_name=user_in.full_name,
@@ -30,7 +23,16 @@ def create_user(user_in: schemas.UserCreate, db: Session = Depends(get_db)):
         role=UserRole.USER,
     )
     db.add(new_user)
-    db.commit()
+    try:
+        # The unique email and phone number indexes reject duplicates in the
+        # INSERT itself, without a separate lookup that could race it
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail="User with this email or phone number already exists",
+        )
     db.refresh(new_user)
     return new_user
 
@@ -55,7 +57,9 @@ def update_current_user(
         current_user.email = user_in.email
     if user_in.phone_number:
         current_user.phone_number = user_in.phone_number
-    db.add(current_user)
+
+    # The user is fully loaded; commit flushes a single UPDATE of the changed
+    # columns, and the response is built first so no refresh is needed
+    response = schemas.UserResponse.model_validate(current_user)
     db.commit()
-    db.refresh(current_user)
-    return current_user
+    return response
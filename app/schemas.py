@@ -1,6 +1,6 @@
 # app/schemas.py
 
-from pydantic import BaseModel, EmailStr, ConfigDict, computed_field, field_validator, Field
+from pydantic import BaseModel, EmailStr, ConfigDict, computed_field, field_validator, Field, TypeAdapter
 from typing import Optional, List
 from app.models import AppointmentStatus, BarberStatus, QueueStatus
 from enum import Enum
@@ -195,8 +195,10 @@ class ServiceBase(BaseModel):
 class ServiceCreate(ServiceBase):
     pass
 
-class ServiceUpdate(ServiceBase):
-    pass
+class ServiceUpdate(BaseModel):
+    name: Optional[str] = None
+    duration: Optional[int] = None
+    price: Optional[float] = None
 
 class ServiceResponse(ServiceBase):
     id: int
@@ -286,6 +288,9 @@ class BarberScheduleResponse(BaseModel):
             end_time=obj.end_time
         )
 
+# Validates a whole list of schedules in one pydantic-core call
+BarberScheduleListAdapter = TypeAdapter(List[BarberScheduleResponse])
+
 
 # Update login schema
 class LoginRequest(BaseModel):
@@ -335,19 +340,37 @@ class QueueStatusUpdate(BaseModel):
 class QueueEntryBase(BaseModel):
     shop_id: int
     user_id: Optional[int] = None
-    service_id: int
+    service_id: Optional[int] = None
     full_name: Optional[str] = None
     phone_number: Optional[str] = None
 
 class QueueEntryCreate(QueueEntryBase):
     pass
 
+class QueueEntryBarberUser(BaseModel):
+    full_name: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+class QueueEntryBarber(BaseModel):
+    id: int
+    status: BarberStatus
+    user: QueueEntryBarberUser = Field(exclude=True)
+
+    @computed_field
+    def full_name(self) -> str:
+        return self.user.full_name
+
+    model_config = ConfigDict(from_attributes=True)
+
 class QueueEntryResponse(QueueEntryBase):
     id: int
     status: str
     check_in_time: datetime
     service_start_time: Optional[datetime] = None
     service_end_time: Optional[datetime] = None
+    barber_id: Optional[int] = None
+    barber: Optional[QueueEntryBarber] = None
 
     # Add validators for all datetime fields
     @field_validator('check_in_time', 'service_start_time', 'service_end_time')
@@ -1,6 +1,19 @@
 from datetime import datetime, time
+from typing import Optional, List, Dict
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from app import models
+import time as _time
+
+# shop_id -> (wait time in minutes, when it was computed). Dashboards poll
+# these values, so they are reused for a short while and dropped whenever a
+# shop's scheduled appointments change.
+_wait_time_cache = {}
+WAIT_TIME_CACHE_TTL = 30  # seconds
+
+def invalidate_wait_time(shop_id: int) -> None:
+    """Forget the cached wait time of a shop"""
+    _wait_time_cache.pop(shop_id, None)
 
 def calculate_wait_time(db: Session, shop_id: int) -> int:
     """
@@ -8,28 +21,62 @@ def calculate_wait_time(db: Session, shop_id: int) -> int:
     This is a simplified example - you should implement your own logic
     based on active appointments, staff availability, etc.
     """
+    cached = _wait_time_cache.get(shop_id)
+    if cached is not None and _time.monotonic() - cached[1] < WAIT_TIME_CACHE_TTL:
+        return cached[0]
+
     active_appointments = db.query(models.Appointment).filter(
         models.Appointment.shop_id == shop_id,
         models.Appointment.status == models.AppointmentStatus.SCHEDULED
     ).count()
     
     # Simplified calculation: 15 minutes per active appointment
-    return active_appointments * 15
+    wait_time = active_appointments * 15
+    _wait_time_cache[shop_id] = (wait_time, _time.monotonic())
+    return wait_time
 
-def is_shop_open(shop) -> bool:
+def calculate_wait_times(db: Session, shop_ids: List[int]) -> Dict[int, int]:
     """
-    Check if the shop is currently open based on operating hours
+    Calculate estimated wait times for several shops at once.
+    Shops without a fresh cached value are counted in a single GROUP BY query.
     """
-    current_time = datetime.now().time()
+    now = _time.monotonic()
+    wait_times = {}
+    missing = []
+    for shop_id in shop_ids:
+        cached = _wait_time_cache.get(shop_id)
+        if cached is not None and now - cached[1] < WAIT_TIME_CACHE_TTL:
+            wait_times[shop_id] = cached[0]
+        else:
+            missing.append(shop_id)
+
+    if missing:
+        counts = dict(
+            db.query(models.Appointment.shop_id, func.count(models.Appointment.id))
+            .filter(
+                models.Appointment.shop_id.in_(missing),
+                models.Appointment.status == models.AppointmentStatus.SCHEDULED
+            )
+            .group_by(models.Appointment.shop_id)
+            .all()
+        )
+        for shop_id in missing:
+            # Same simplified calculation as calculate_wait_time
+            wait_times[shop_id] = counts.get(shop_id, 0) * 15
+            _wait_time_cache[shop_id] = (wait_times[shop_id], now)
+
+    return wait_times
+
+def is_shop_open(shop, current_time: Optional[time] = None) -> bool:
+    """
+    Check if the shop is currently open based on operating hours.
+    Pass current_time when checking many shops so the clock is read once.
+    """
+    if current_time is None:
+        current_time = datetime.now().time()
     
     # Handle overnight business hours
     if shop.closing_time < shop.opening_time:
         return current_time >= shop.opening_time or current_time <= shop.closing_time
     
     return shop.opening_time <= current_time <= shop.closing_time
-
-def format_time(t: time) -> str:
-    """
-    Format time in 12-hour format with AM/PM
-    """
-    return t.strftime("%I:%M %p")
\ No newline at end of file
@@ -0,0 +1,10 @@
+from datetime import time
+from functools import lru_cache
+
+@lru_cache(maxsize=1024)
+def format_time(t: time) -> str:
+    """
+    Format time in 12-hour format with AM/PM.
+    Shop hours repeat a lot across shops, so results are cached.
+    """
+    return t.strftime("%I:%M %p")
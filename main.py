@@ -48,6 +48,7 @@ app.add_middleware(
 @app.on_event("startup")
 def on_startup():
     init_db()
+    os.makedirs(shop_owners.UPLOAD_DIR, exist_ok=True)
 
 app.mount("/static", StaticFiles(directory="static"), name="static")
 app.include_router(auth.router)